@@ -1 +1 @@
-from .client import halo_system, HaloPaymentTools
+from .client import halo_system, halo_system_async, HaloPaymentTools, Halo402Error
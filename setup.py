@@ -15,12 +15,18 @@ setup(
         "requests>=2.25.0",
         "web3>=6.0.0",
         "google-generativeai>=0.3.0",
-        "eth-account>=0.5.9"
+        "eth-account>=0.10.0",
+        "coincurve>=15.0.0"
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8.0"],
+        "fast": ["orjson>=3.0.0"],
+        "test": ["pytest"],
+    },
     author="Halo Team",
     description="Python SDK for Halo API with built-in x402 auto-payment",
     long_description=long_description,
     long_description_content_type="text/markdown",
     keywords="halo, x402, payment, ai, llm, gemini",
-    python_requires=">=3.7",
+    python_requires=">=3.8",
 )
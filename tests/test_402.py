@@ -0,0 +1,79 @@
+import base64
+import json
+import warnings
+
+import pytest
+import requests
+
+from halo.client import HaloAutoHandler, _is_402
+
+REQ = {"x402Version": 2, "accepts": [{"amount": "1"}], "resource": {"description": "d"}}
+
+
+class _Response:
+    def __init__(self, status_code=402, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def _error(headers=None, status_code=402):
+    e = Exception("payment required")
+    e.response = _Response(status_code, headers)
+    return e
+
+
+def _aiohttp_error(status, headers=None):
+    aiohttp = pytest.importorskip("aiohttp")
+    from multidict import CIMultiDict, CIMultiDictProxy
+    from yarl import URL
+    info = aiohttp.RequestInfo(URL("http://halo"), "POST", CIMultiDictProxy(CIMultiDict()), URL("http://halo"))
+    return aiohttp.ClientResponseError(info, (), status=status, headers=CIMultiDictProxy(CIMultiDict(headers or {})))
+
+
+@pytest.fixture
+def handler():
+    return HaloAutoHandler("0x" + "11" * 32, "key", "http://halo", "https://mainnet.base.org")
+
+
+def test_is_402_requests_http_error():
+    assert _is_402(requests.HTTPError("402 Client Error: Payment Required for url: http://halo"))
+    assert _is_402(requests.HTTPError("error", response=_Response(402)))
+    assert not _is_402(requests.HTTPError("500 Server Error: Internal Server Error"))
+
+
+def test_is_402_aiohttp_client_response_error():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # ClientResponseError.code is deprecated and must not be touched
+        assert _is_402(_aiohttp_error(402))
+        assert not _is_402(_aiohttp_error(500))
+
+
+def test_is_402_code_attribute():
+    e = Exception("payment required")
+    e.code = 402
+    assert _is_402(e)
+
+
+def test_is_402_ignores_message_text():
+    assert not _is_402(Exception("model output mentions 402 somewhere"))
+    assert not _is_402(_error(status_code=500))
+
+
+def test_extract_req_base64_header(handler):
+    header = base64.b64encode(json.dumps(REQ).encode()).decode()
+    assert handler._extract_req(_error({"payment-required": header})) == REQ
+
+
+def test_extract_req_plain_json_header(handler):
+    assert handler._extract_req(_error({"x-halo-requirement": json.dumps(REQ)})) == REQ
+
+
+def test_extract_req_malformed_header(handler):
+    assert handler._extract_req(_error({"payment-required": "!!not-base64"})) is None
+    assert handler._extract_req(_error({"payment-required": "{not json"})) is None
+    assert handler._extract_req(Exception("no response")) is None
+
+
+def test_extract_req_aiohttp_error_headers(handler):
+    header = base64.b64encode(json.dumps(REQ).encode()).decode()
+    assert handler._extract_req(_aiohttp_error(402, {"Payment-Required": header})) == REQ
@@ -0,0 +1,57 @@
+import base64
+import json
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+from hexbytes import HexBytes
+
+from halo import HaloPaymentTools
+from halo import client
+
+PRIVATE_KEY = "0x" + "11" * 32
+REQUIREMENT = {
+    "amount": "1000000",
+    "asset": "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913",
+    "payTo": "0x209693bc6afc0c5328ba36faf03c514ef312287c",
+    "extra": {"name": "USD Coin", "version": "2"},
+}
+NOW = 1_700_000_000
+NONCE = bytes(range(32))
+
+
+def _reference_signature(tools):
+    # Straight eth_account EIP-712 signing, independent of the cached/compiled signer
+    structured = encode_typed_data(
+        domain_data={
+            "name": "USD Coin", "version": "2", "chainId": 8453,
+            "verifyingContract": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+        },
+        message_types=client._TRANSFER_TYPES,
+        message_data={
+            "from": tools._addr, "to": "0x209693Bc6afc0C5328bA36FaF03C514EF312287C",
+            "value": 1000000, "validAfter": NOW - 60, "validBefore": NOW + 3600, "nonce": NONCE,
+        },
+    )
+    return structured, Account.from_key(PRIVATE_KEY).sign_message(structured).signature.hex()
+
+
+@pytest.mark.parametrize("native", [True, False], ids=["coincurve", "eth_account"])
+def test_sign_payment_matches_eth_account(monkeypatch, native):
+    tools = HaloPaymentTools(private_key=PRIVATE_KEY)
+    if native and tools._cc_key is None: pytest.skip("coincurve not installed")
+    if not native: tools._cc_key = None
+    monkeypatch.setattr(client.time, "time", lambda: NOW)
+    monkeypatch.setattr(client.os, "urandom", lambda n: NONCE)
+
+    payload = json.loads(base64.b64decode(tools.sign_payment(REQUIREMENT)))
+    structured, expected = _reference_signature(tools)
+
+    signature = payload["payload"]["signature"]
+    assert signature == expected
+    assert Account.recover_message(structured, signature=HexBytes(signature)) == tools._addr
+    assert payload["payload"]["authorization"] == {
+        "from": tools._addr, "to": "0x209693Bc6afc0C5328bA36FaF03C514EF312287C",
+        "value": "1000000", "validAfter": str(NOW - 60), "validBefore": str(NOW + 3600),
+        "nonce": "0x" + NONCE.hex(),
+    }